@@ -18,23 +18,73 @@ A comprehensive network diagnostic tool that provides:
 import os
 import re
 import sys
+import json
 import time
 import socket
 import platform
 import subprocess
-import threading
+import asyncio
+import errno
+import selectors
+import collections
+import functools
+import inspect
+import ipaddress
 from datetime import datetime
 from prettytable import PrettyTable
 
 try:
     import netifaces
-    import requests
-    import speedtest
-    from scapy.all import ARP, Ether, srp
 except ImportError as e:
     print(f"Missing dependency: {e.name}. Install with: pip install {e.name}")
     sys.exit(1)
 
+# Not available on Windows, where open sockets are not capped by RLIMIT_NOFILE
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Optional: icmplib sends echo requests without spawning ping
+try:
+    from icmplib import ping as _icmp_ping
+except ImportError:
+    _icmp_ping = None
+
+# Optional: pyroute2 reads the Linux routing table over netlink
+try:
+    from pyroute2 import IPRoute
+except ImportError:
+    IPRoute = None
+
+# Host platform, looked up once at import
+_SYSTEM = platform.system()
+_IS_WINDOWS = _SYSTEM == "Windows"
+
+# connect_ex results meaning a non-blocking connect is under way
+_CONNECT_PENDING = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN}
+# Errors meaning the process or system has run out of file descriptors
+_FD_EXHAUSTED = {errno.EMFILE, errno.ENFILE}
+# Descriptors port_scan leaves free for everything else in the process
+_FD_HEADROOM = 32
+
+# Patterns used by the output parsers, compiled once at import
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+_IPV4_RE = re.compile(rb'^\d+\.\d+\.\d+\.\d+')
+_IWCONFIG_RE = re.compile(
+    r'ESSID:"(?P<ssid>.*?)"|Link Quality=(?P<quality>\d+/\d+)|Signal level=(?P<signal>-?\d+) dBm'
+)
+_AIRPORT_RE = re.compile(
+    r'^\s*(?:SSID: (?P<ssid>.+)|agrCtlRSSI: (?P<rssi>.+)|agrCtlNoise: (?P<noise>.+))', re.MULTILINE
+)
+
+def _scan_fields(pattern, text):
+    """Collect the first value of each named group in one pass over text"""
+    fields = {}
+    for match in pattern.finditer(text):
+        fields.setdefault(match.lastgroup, match.group(match.lastgroup))
+    return fields
+
 # Colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -46,12 +96,77 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Cached collector results are reused for this many seconds
+CACHE_TTL = 300
+# Longest ARP/connection listing kept in memory, in lines
+MAX_OUTPUT_LINES = 2000
+# Tables longer than this skip PrettyTable's column sizing and print as TSV
+MAX_PRETTY_TABLE_ROWS = 1000
+EXTERNAL_IP_URLS = ('https://api.ipify.org', 'https://ident.me')
+EXTERNAL_IP_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "network_analyzer", "extip.json")
+
+def ttl_cached(attr):
+    """Reuse the value a collector stored in `attr` for CACHE_TTL seconds
+
+    Collectors return False when they stored an error instead of a result;
+    those values are not cached, so the next call tries again.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self):
+            key = func.__name__
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < CACHE_TTL:
+                setattr(self, attr, cached[1])
+                return
+            if await func(self) is False:
+                return
+            self._cache[key] = (time.monotonic(), getattr(self, attr))
+        return wrapper
+    return decorator
+
+def bold(text):
+    """Wrap text in the bold terminal colour"""
+    return Colors.BOLD + str(text) + Colors.ENDC
+
+def blue(text):
+    """Wrap text in the blue terminal colour"""
+    return Colors.OKBLUE + str(text) + Colors.ENDC
+
+def green(text):
+    """Wrap text in the green terminal colour"""
+    return Colors.OKGREEN + str(text) + Colors.ENDC
+
+def _stdout_is_tty():
+    """Whether stdout is a terminal right now, so colour codes are wanted"""
+    return sys.stdout is not None and sys.stdout.isatty()
+
+def _emit(text=""):
+    """Print a line, dropping colour codes unless stdout is a terminal"""
+    if not _stdout_is_tty():
+        text = _ANSI_RE.sub('', text)
+    print(text)
+
 class NetworkAnalyzerPro:
+    # Table headers never change, so colour them once
+    _PROPERTY_FIELDS = [bold("Property"), bold("Value")]
+    _METRIC_FIELDS = [bold("Metric"), bold("Value")]
+    _INTERFACE_FIELDS = [bold(name) for name in ("Interface", "IP Address", "Netmask", "MAC Address", "Broadcast")]
+    _ROUTE_FIELDS = [bold(name) for name in ("Destination", "Gateway", "Netmask", "Interface", "Metric/Flags")]
+    _GATEWAY_FIELDS = [bold(name) for name in ("Type", "Gateway IP", "Interface")]
+    _IPV4_LABEL = blue("IPv4")
+    _IPV6_LABEL = blue("IPv6")
+
     def __init__(self):
-        self.system = platform.system()
+        self.system = _SYSTEM
         self.colors = Colors()
         self.start_time = time.time()
-        self.interface_details = {}
+        # Interface details are kept as parallel lists, one entry per interface
+        self._if_names = []
+        self._if_ips = []
+        self._if_masks = []
+        self._if_macs = []
+        self._if_bcasts = []
         self.routing_table = []
         self.arp_table = ""
         self.dns_info = ""
@@ -61,11 +176,26 @@ class NetworkAnalyzerPro:
         self.active_connections = []
         self.speed_test_results = {}
         self.hostname = socket.gethostname()
+        self._cache = {}
+        self._http = None
+
+    def collect_all_info(self, force_refresh=False):
+        """Collect all network information concurrently with timing"""
+        _emit(f"{self.colors.OKBLUE}Collecting network information...{self.colors.ENDC}")
+        if force_refresh:
+            self.clear_cache()
+        asyncio.run(self._collect_async())
+
+    def clear_cache(self):
+        """Drop cached results so the next collection re-runs every command"""
+        self._cache.clear()
+        try:
+            os.remove(EXTERNAL_IP_CACHE)
+        except OSError:
+            pass
 
-    def collect_all_info(self):
-        """Collect all network information with timing"""
-        print(f"{self.colors.OKBLUE}Collecting network information...{self.colors.ENDC}")
-        
+    async def _collect_async(self):
+        """Run every collection task at once and wait for all of them"""
         tasks = [
             ("System Info", self._get_system_info),
             ("Routing Table", self._get_routing_table),
@@ -78,59 +208,128 @@ class NetworkAnalyzerPro:
             ("Active Connections", self._get_active_connections)
         ]
         
-        for name, task in tasks:
-            start = time.time()
-            try:
-                task()
-                elapsed = time.time() - start
-                print(f"{self.colors.OKGREEN}✓{self.colors.ENDC} {name.ljust(20)} {elapsed:.2f}s")
-            except Exception as e:
-                print(f"{self.colors.FAIL}✗{self.colors.ENDC} {name.ljust(20)} Error: {str(e)}")
+        await asyncio.gather(*(self._run_task(name, task) for name, task in tasks))
+
+    async def _run_task(self, name, task):
+        """Run a single collection task, offloading blocking ones to a thread"""
+        start = time.time()
+        try:
+            if inspect.iscoroutinefunction(task):
+                await task()
+            else:
+                await asyncio.to_thread(task)
+            elapsed = time.time() - start
+            _emit(f"{self.colors.OKGREEN}✓{self.colors.ENDC} {name.ljust(20)} {elapsed:.2f}s")
+        except Exception as e:
+            _emit(f"{self.colors.FAIL}✗{self.colors.ENDC} {name.ljust(20)} Error: {str(e)}")
+
+    @staticmethod
+    async def _run_command(*args, stderr=None, max_lines=None, header_lines=0):
+        """Run a command without a shell and return its raw output
+
+        With max_lines set, output is streamed and only the first header_lines
+        lines plus the last max_lines lines are kept, so very large listings
+        stay bounded in memory but keep their column header.
+        """
+        # No descriptors here need hiding from the child, so skip the
+        # per-fd close loop that dominates spawn time with a high ulimit -n
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE,
+            stderr=stderr, close_fds=False
+        )
+        if max_lines is None:
+            stdout, _ = await proc.communicate()
+        else:
+            head = []
+            tail = collections.deque(maxlen=max_lines)
+            total = 0
+            async for line in proc.stdout:
+                if len(head) < header_lines:
+                    head.append(line)
+                else:
+                    tail.append(line)
+                total += 1
+            await proc.wait()
+            omitted = total - len(head) - len(tail)
+            if omitted:
+                head.append(f"... {omitted} earlier lines omitted ...\n".encode())
+            stdout = b"".join(head) + b"".join(tail)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args, output=stdout)
+        return stdout
 
     def _get_system_info(self):
         """Collect basic system information"""
+        uname = platform.uname()
         self.system_info = {
-            "System": platform.system(),
-            "Node": platform.node(),
-            "Release": platform.release(),
-            "Version": platform.version(),
-            "Machine": platform.machine(),
-            "Processor": platform.processor()
+            "System": uname.system,
+            "Node": uname.node,
+            "Release": uname.release,
+            "Version": uname.version,
+            "Machine": uname.machine,
+            "Processor": uname.processor
         }
 
-    def _get_routing_table(self):
+    @ttl_cached('routing_table')
+    async def _get_routing_table(self):
         """Get system routing table"""
-        if self.system == "Windows":
-            self.routing_table = self._get_windows_routing_table()
-        elif self.system in ["Linux", "Darwin"]:
-            self.routing_table = self._get_unix_routing_table()
+        if _IS_WINDOWS:
+            self.routing_table = await self._get_windows_routing_table()
+        elif _SYSTEM == "Linux" and IPRoute is not None:
+            try:
+                self.routing_table = await asyncio.to_thread(self._get_netlink_routing_table)
+            except Exception:
+                self.routing_table = await self._get_unix_routing_table()
+        elif _SYSTEM in ["Linux", "Darwin"]:
+            self.routing_table = await self._get_unix_routing_table()
         else:
             self.routing_table = {"error": "Unsupported OS"}
+        if isinstance(self.routing_table, dict):
+            return False
 
-    def _get_windows_routing_table(self):
+    async def _get_windows_routing_table(self):
         """Windows-specific routing table"""
         try:
-            result = subprocess.check_output("route print", shell=True).decode('utf-8', 'ignore')
+            result = await self._run_command("route", "print")
             return self._parse_windows_route(result)
         except Exception as e:
             return {"error": str(e)}
 
-    def _get_unix_routing_table(self):
+    @staticmethod
+    def _get_netlink_routing_table():
+        """Linux main routing table read over netlink"""
+        routes = []
+        with IPRoute() as ipr:
+            names = {link['index']: link.get_attr('IFLA_IFNAME') for link in ipr.get_links()}
+            for route in ipr.get_routes(family=socket.AF_INET, table=254):
+                dst_len = route['dst_len']
+                gateway = route.get_attr('RTA_GATEWAY')
+                flags = "U" + ("G" if gateway else "") + ("H" if dst_len == 32 else "")
+                routes.append({
+                    "Destination": route.get_attr('RTA_DST') or "0.0.0.0",
+                    "Gateway": gateway or "0.0.0.0",
+                    "Genmask": str(ipaddress.IPv4Network(f"0.0.0.0/{dst_len}").netmask),
+                    "Flags": flags,
+                    "Interface": names.get(route.get_attr('RTA_OIF'), "")
+                })
+        return routes
+
+    async def _get_unix_routing_table(self):
         """Unix/Linux routing table"""
         try:
-            result = subprocess.check_output("netstat -rn", shell=True).decode('utf-8', 'ignore')
+            result = await self._run_command("netstat", "-rn")
             return self._parse_unix_route(result)
         except Exception as e:
             return {"error": str(e)}
 
     @staticmethod
     def _parse_windows_route(output):
-        """Parse Windows route output"""
+        """Parse raw Windows route output"""
         routes = []
-        for line in output.split('\n'):
-            line = line.strip()
-            if line.startswith("0.0.0.0"):
-                parts = re.split(r'\s+', line)
+        for line in output.splitlines():
+            parts = line.split()
+            if parts and parts[0].startswith(b"0.0.0.0"):
+                parts = [part.decode('utf-8', 'ignore') for part in parts]
                 if len(parts) >= 5:
                     routes.append({
                         "Destination": parts[0],
@@ -143,12 +342,14 @@ class NetworkAnalyzerPro:
 
     @staticmethod
     def _parse_unix_route(output):
-        """Parse Unix route output"""
+        """Parse raw Unix route output"""
         routes = []
-        for line in output.split('\n'):
-            line = line.strip()
-            if line.startswith("default") or line.startswith("0.0.0.0"):
-                parts = re.split(r'\s+', line)
+        for line in output.splitlines():
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0].startswith(b"default") or parts[0].startswith(b"0.0.0.0"):
+                parts = [part.decode('utf-8', 'ignore') for part in parts]
                 if len(parts) >= 4:
                     routes.append({
                         "Destination": "default" if parts[0] == "default" else parts[0],
@@ -157,8 +358,8 @@ class NetworkAnalyzerPro:
                         "Flags": parts[3] if len(parts) > 3 else "",
                         "Interface": parts[5] if len(parts) > 5 else ""
                     })
-            elif re.match(r'^\d+\.\d+\.\d+\.\d+', line):
-                parts = re.split(r'\s+', line)
+            elif _IPV4_RE.match(parts[0]):
+                parts = [part.decode('utf-8', 'ignore') for part in parts]
                 if len(parts) >= 5:
                     routes.append({
                         "Destination": parts[0],
@@ -171,109 +372,183 @@ class NetworkAnalyzerPro:
 
     def _get_interface_details(self):
         """Get detailed interface information"""
-        self.interface_details = {}
+        names, ips, masks, macs, bcasts = [], [], [], [], []
         for interface in netifaces.interfaces():
             try:
                 addrs = netifaces.ifaddresses(interface)
-                if netifaces.AF_INET in addrs:
-                    self.interface_details[interface] = {
-                        'IP': addrs[netifaces.AF_INET][0]['addr'],
-                        'Netmask': addrs[netifaces.AF_INET][0]['netmask'],
-                        'MAC': addrs[netifaces.AF_LINK][0]['addr'] if netifaces.AF_LINK in addrs else None,
-                        'Broadcast': addrs[netifaces.AF_INET][0].get('broadcast', 'N/A')
-                    }
+                if netifaces.AF_INET not in addrs:
+                    continue
+                inet = addrs[netifaces.AF_INET][0]
+                ip, mask = inet['addr'], inet['netmask']
+                mac = addrs[netifaces.AF_LINK][0]['addr'] if netifaces.AF_LINK in addrs else None
             except (ValueError, KeyError):
                 continue
+            # Append only once every field is known so the lists stay aligned
+            names.append(interface)
+            ips.append(ip)
+            masks.append(mask)
+            macs.append(mac)
+            bcasts.append(inet.get('broadcast', 'N/A'))
+        self._if_names, self._if_ips, self._if_masks, self._if_macs, self._if_bcasts = names, ips, masks, macs, bcasts
+
+    @property
+    def interface_details(self):
+        """Interface details as a dict of dicts keyed by interface name"""
+        return {
+            name: {'IP': ip, 'Netmask': mask, 'MAC': mac, 'Broadcast': bcast}
+            for name, ip, mask, mac, bcast in zip(
+                self._if_names, self._if_ips, self._if_masks, self._if_macs, self._if_bcasts
+            )
+        }
 
-    def _get_arp_table(self):
+    @ttl_cached('arp_table')
+    async def _get_arp_table(self):
         """Get system ARP table"""
         try:
-            if self.system == "Windows":
-                self.arp_table = subprocess.check_output("arp -a", shell=True).decode('utf-8', 'ignore')
+            if _IS_WINDOWS:
+                self.arp_table = await self._run_command("arp", "-a", max_lines=MAX_OUTPUT_LINES, header_lines=3)
             else:
-                self.arp_table = subprocess.check_output("arp -n", shell=True).decode('utf-8', 'ignore')
+                self.arp_table = await self._run_command("arp", "-n", max_lines=MAX_OUTPUT_LINES, header_lines=1)
         except Exception as e:
             self.arp_table = f"Error getting ARP table: {str(e)}"
+            return False
 
-    def _get_dns_info(self):
+    @ttl_cached('dns_info')
+    async def _get_dns_info(self):
         """Get DNS server information"""
         try:
-            if self.system == "Windows":
-                self.dns_info = subprocess.check_output("ipconfig /all", shell=True).decode('utf-8', 'ignore')
+            if _IS_WINDOWS:
+                self.dns_info = await self._run_command("ipconfig", "/all")
             else:
-                self.dns_info = subprocess.check_output("cat /etc/resolv.conf", shell=True).decode('utf-8', 'ignore')
+                with open("/etc/resolv.conf", "rb") as f:
+                    self.dns_info = f.read()
         except Exception as e:
             self.dns_info = f"Error getting DNS info: {str(e)}"
+            return False
 
     def _get_gateway_info(self):
         """Get gateway information"""
         self.gateway_info = netifaces.gateways().get('default', {})
 
-    def _get_external_ip(self):
-        """Get public IP address"""
+    @ttl_cached('external_ip')
+    async def _get_external_ip(self):
+        """Get public IP address, reusing the on-disk copy from a recent run"""
+        self.external_ip = self._load_external_ip()
+        if self.external_ip:
+            return
         try:
-            self.external_ip = requests.get('https://api.ipify.org').text
-        except:
+            # Importing requests is slow; keep it off the event loop
+            http = await asyncio.to_thread(self._http_session)
+        except ImportError as e:
+            self.external_ip = f"Error: Missing dependency {e.name}. Install with: pip install requests"
+            return False
+        for url in EXTERNAL_IP_URLS:
             try:
-                self.external_ip = requests.get('https://ident.me').text
+                response = await asyncio.to_thread(http.get, url, timeout=(1, 2))
+                response.raise_for_status()
+                self.external_ip = response.text
+                break
             except Exception as e:
                 self.external_ip = f"Error: {str(e)}"
+        else:
+            return False
+        self._save_external_ip(self.external_ip)
+
+    def _http_session(self):
+        """Return the shared HTTP session, importing requests on first use"""
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            self._http = requests.Session()
+            self._http.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=Retry(total=1)))
+        return self._http
 
-    def _get_wifi_info(self):
+    @staticmethod
+    def _load_external_ip():
+        """Return the persisted external IP if it is still fresh"""
+        try:
+            with open(EXTERNAL_IP_CACHE) as f:
+                cached = json.load(f)
+            if time.time() - cached['timestamp'] < CACHE_TTL:
+                return str(ipaddress.ip_address(cached['ip']))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    @staticmethod
+    def _save_external_ip(ip):
+        """Persist a valid external IP so later runs can skip the lookup"""
+        try:
+            ip = str(ipaddress.ip_address(ip.strip()))
+            os.makedirs(os.path.dirname(EXTERNAL_IP_CACHE), exist_ok=True)
+            with open(EXTERNAL_IP_CACHE, 'w') as f:
+                json.dump({'ip': ip, 'timestamp': time.time()}, f)
+        except (OSError, ValueError):
+            pass
+
+    @ttl_cached('wifi_info')
+    async def _get_wifi_info(self):
         """Get WiFi signal information (Linux/macOS)"""
-        if self.system == "Linux":
+        if _SYSTEM == "Linux":
             try:
-                result = subprocess.check_output(["iwconfig"], stderr=subprocess.STDOUT).decode()
-                essid = re.search(r'ESSID:"(.*?)"', result)
-                quality = re.search(r'Link Quality=(\d+/\d+)', result)
-                signal = re.search(r'Signal level=(-?\d+) dBm', result)
+                result = (await self._run_command("iwconfig", stderr=asyncio.subprocess.STDOUT)).decode()
+                fields = _scan_fields(_IWCONFIG_RE, result)
                 
                 self.wifi_info = {
-                    'SSID': essid.group(1) if essid else 'N/A',
-                    'Quality': quality.group(1) if quality else 'N/A',
-                    'Signal': f"{signal.group(1)} dBm" if signal else 'N/A'
+                    'SSID': fields.get('ssid', 'N/A'),
+                    'Quality': fields.get('quality', 'N/A'),
+                    'Signal': f"{fields['signal']} dBm" if 'signal' in fields else 'N/A'
                 }
             except:
                 self.wifi_info = {'Error': 'Could not get WiFi info'}
-        elif self.system == "Darwin":
+                return False
+        elif _SYSTEM == "Darwin":
             try:
-                result = subprocess.check_output(["/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport", "-I"]).decode()
+                result = (await self._run_command("/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport", "-I")).decode()
+                fields = _scan_fields(_AIRPORT_RE, result)
+
                 self.wifi_info = {
-                    'SSID': re.search(r'SSID: (.+)', result).group(1).strip() if re.search(r'SSID: (.+)', result) else 'N/A',
-                    'RSSI': re.search(r'agrCtlRSSI: (.+)', result).group(1).strip() if re.search(r'agrCtlRSSI: (.+)', result) else 'N/A',
-                    'Noise': re.search(r'agrCtlNoise: (.+)', result).group(1).strip() if re.search(r'agrCtlNoise: (.+)', result) else 'N/A'
+                    'SSID': fields['ssid'].strip() if 'ssid' in fields else 'N/A',
+                    'RSSI': fields['rssi'].strip() if 'rssi' in fields else 'N/A',
+                    'Noise': fields['noise'].strip() if 'noise' in fields else 'N/A'
                 }
             except:
                 self.wifi_info = {'Error': 'Could not get WiFi info'}
+                return False
 
-    def _get_active_connections(self):
+    @ttl_cached('active_connections')
+    async def _get_active_connections(self):
         """Get active network connections"""
         try:
-            if self.system == "Windows":
-                self.active_connections = subprocess.check_output("netstat -ano", shell=True).decode('utf-8', 'ignore')
+            if _IS_WINDOWS:
+                self.active_connections = await self._run_command("netstat", "-ano", max_lines=MAX_OUTPUT_LINES, header_lines=4)
             else:
-                self.active_connections = subprocess.check_output("netstat -tulnp", shell=True).decode('utf-8', 'ignore')
+                self.active_connections = await self._run_command("netstat", "-tulnp", max_lines=MAX_OUTPUT_LINES, header_lines=2)
         except Exception as e:
             self.active_connections = f"Error getting connections: {str(e)}"
+            return False
 
     def run_speed_test(self):
         """Run internet speed test"""
-        print(f"{self.colors.OKBLUE}Running speed test...{self.colors.ENDC}")
+        _emit(f"{self.colors.OKBLUE}Running speed test...{self.colors.ENDC}")
+        try:
+            import speedtest
+        except ImportError as e:
+            self.speed_test_results = {'Error': f"Missing dependency {e.name}. Install with: pip install speedtest-cli"}
+            return
         try:
             st = speedtest.Speedtest()
             st.get_best_server()
             
-            download_thread = threading.Thread(target=st.download)
-            upload_thread = threading.Thread(target=st.upload)
-            
-            download_thread.start()
-            upload_thread.start()
-            
-            print(f"{self.colors.OKBLUE}Testing download speed...{self.colors.ENDC}")
-            download_thread.join()
+            # Speedtest parallelises each transfer internally; the object
+            # itself is not thread-safe, so run the phases in order.
+            _emit(f"{self.colors.OKBLUE}Testing download speed...{self.colors.ENDC}")
+            st.download(threads=4)
             
-            print(f"{self.colors.OKBLUE}Testing upload speed...{self.colors.ENDC}")
-            upload_thread.join()
+            _emit(f"{self.colors.OKBLUE}Testing upload speed...{self.colors.ENDC}")
+            st.upload(threads=4)
             
             self.speed_test_results = {
                 'Download': f"{st.results.download / 1_000_000:.2f} Mbps",
@@ -284,50 +559,108 @@ class NetworkAnalyzerPro:
         except Exception as e:
             self.speed_test_results = {'Error': str(e)}
 
-    def port_scan(self, target, ports="1-1024", timeout=1):
+    def port_scan(self, target, ports="1-1024", timeout=1, concurrency=500):
         """Basic port scanner"""
-        print(f"{self.colors.OKBLUE}Scanning {target} ports {ports}...{self.colors.ENDC}")
+        _emit(f"{self.colors.OKBLUE}Scanning {target} ports {ports}...{self.colors.ENDC}")
         try:
             start_port, end_port = map(int, ports.split('-'))
-            open_ports = []
-            
-            def scan_port(port):
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                        s.settimeout(timeout)
-                        result = s.connect_ex((target, port))
-                        if result == 0:
-                            open_ports.append(port)
-                except:
-                    pass
-            
-            threads = []
-            for port in range(start_port, end_port + 1):
-                t = threading.Thread(target=scan_port, args=(port,))
-                threads.append(t)
-                t.start()
-            
-            for t in threads:
-                t.join()
-            
-            return open_ports
+            if not 0 <= start_port <= end_port <= 65535:
+                raise ValueError(f"invalid port range {ports}, expected start-end within 0-65535")
+            return sorted(self._scan_ports(target, range(start_port, end_port + 1), timeout, concurrency))
         except Exception as e:
             return f"Scan error: {str(e)}"
 
+    @staticmethod
+    def _scan_ports(target, ports, timeout, concurrency):
+        """Yield open ports as non-blocking connects complete, at most `concurrency` in flight"""
+        host = socket.gethostbyname(target)
+        pending = iter(ports)
+        deferred = None
+        # Every probe gets the same timeout, so deadlines expire in start order
+        deadlines = collections.deque()
+        # Stay under the open-file limit, leaving room for the rest of the process
+        if resource is not None:
+            soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if soft_limit != resource.RLIM_INFINITY:
+                concurrency = max(1, min(concurrency, soft_limit - _FD_HEADROOM))
+
+        with selectors.DefaultSelector() as selector:
+            try:
+                while True:
+                    while len(selector.get_map()) < concurrency:
+                        if deferred is not None:
+                            port, deferred = deferred, None
+                        else:
+                            port = next(pending, None)
+                        if port is None:
+                            break
+                        try:
+                            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                        except OSError as e:
+                            # Out of descriptors: wait for in-flight probes to free some
+                            if e.errno in _FD_EXHAUSTED and selector.get_map():
+                                deferred = port
+                                break
+                            raise
+                        try:
+                            sock.setblocking(False)
+                            result = sock.connect_ex((host, port))
+                        except Exception:
+                            sock.close()
+                            raise
+                        if result in _FD_EXHAUSTED and selector.get_map():
+                            sock.close()
+                            deferred = port
+                            break
+                        if result in _CONNECT_PENDING:
+                            selector.register(sock, selectors.EVENT_WRITE, port)
+                            deadlines.append((time.monotonic() + timeout, sock))
+                        else:
+                            sock.close()
+
+                    if not selector.get_map():
+                        break
+
+                    wait = max(0, deadlines[0][0] - time.monotonic())
+                    for key, _ in selector.select(wait):
+                        sock = key.fileobj
+                        selector.unregister(sock)
+                        is_open = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                        sock.close()
+                        if is_open:
+                            yield key.data
+
+                    now = time.monotonic()
+                    while deadlines and (deadlines[0][1].fileno() == -1 or deadlines[0][0] <= now):
+                        _, sock = deadlines.popleft()
+                        if sock.fileno() != -1:
+                            selector.unregister(sock)
+                            sock.close()
+            finally:
+                for key in list(selector.get_map().values()):
+                    key.fileobj.close()
+
     def ping_test(self, target, count=4):
         """Ping a network target"""
+        if _icmp_ping is not None:
+            try:
+                return _icmp_ping(target, count=count, interval=0.05, timeout=1, privileged=False).is_alive
+            except Exception:
+                pass  # e.g. unprivileged ICMP not permitted; use the system ping
         try:
-            param = "-n" if self.system == "Windows" else "-c"
+            param = "-n" if _IS_WINDOWS else "-c"
             command = ["ping", param, str(count), target]
+            if _SYSTEM == "Linux":
+                command[1:1] = ["-i", "0.2"]
             return subprocess.call(command) == 0
         except:
             return False
 
     def display_all_info(self):
         """Display all collected information with sections"""
-        print(f"\n{self.colors.HEADER}{'='*80}{self.colors.ENDC}")
-        print(f"{self.colors.BOLD}{'NETWORK ANALYZER PRO'.center(80)}{self.colors.ENDC}")
-        print(f"{self.colors.HEADER}{'='*80}{self.colors.ENDC}")
+        _emit(f"\n{self.colors.HEADER}{'='*80}{self.colors.ENDC}")
+        _emit(f"{self.colors.BOLD}{'NETWORK ANALYZER PRO'.center(80)}{self.colors.ENDC}")
+        _emit(f"{self.colors.HEADER}{'='*80}{self.colors.ENDC}")
         
         sections = [
             ("SYSTEM INFORMATION", self._display_system_info),
@@ -343,161 +676,124 @@ class NetworkAnalyzerPro:
         ]
         
         for title, display_func in sections:
-            print(f"\n{self.colors.OKBLUE}{'-'*80}{self.colors.ENDC}")
-            print(f"{self.colors.BOLD}{title.center(80)}{self.colors.ENDC}")
-            print(f"{self.colors.OKBLUE}{'-'*80}{self.colors.ENDC}")
+            _emit(f"\n{self.colors.OKBLUE}{'-'*80}{self.colors.ENDC}")
+            _emit(f"{self.colors.BOLD}{title.center(80)}{self.colors.ENDC}")
+            _emit(f"{self.colors.OKBLUE}{'-'*80}{self.colors.ENDC}")
             display_func()
         
         elapsed = time.time() - self.start_time
-        print(f"\n{self.colors.OKGREEN}Scan completed in {elapsed:.2f} seconds{self.colors.ENDC}")
+        _emit(f"\n{self.colors.OKGREEN}Scan completed in {elapsed:.2f} seconds{self.colors.ENDC}")
 
-    def _display_system_info(self):
-        """Display system information"""
+    def _print_table(self, field_names, rows):
+        """Print rows as a left-aligned table, or as plain TSV when piped or very long"""
+        if not _stdout_is_tty() or len(rows) > MAX_PRETTY_TABLE_ROWS:
+            _emit('\n'.join('\t'.join(map(str, row)) for row in [field_names, *rows]))
+            return
         table = PrettyTable()
-        table.field_names = [f"{self.colors.BOLD}Property{self.colors.ENDC}", f"{self.colors.BOLD}Value{self.colors.ENDC}"]
+        table.field_names = field_names
         table.align = "l"
-        
-        for key, value in self.system_info.items():
-            table.add_row([
-                f"{self.colors.OKBLUE}{key}{self.colors.ENDC}",
-                f"{self.colors.OKGREEN}{value}{self.colors.ENDC}"
-            ])
-        
+        table.add_rows(rows)
         print(table)
 
+    def _print_key_value_table(self, field_names, items):
+        """Print a two-column table with coloured keys and values"""
+        self._print_table(field_names, [
+            [blue(key), green(value)]
+            for key, value in items.items()
+        ])
+
+    def _display_system_info(self):
+        """Display system information"""
+        self._print_key_value_table(self._PROPERTY_FIELDS, self.system_info)
+
     def _display_interfaces(self):
         """Display network interfaces"""
-        if not self.interface_details:
-            print(f"{self.colors.WARNING}No interface information available{self.colors.ENDC}")
+        if not self._if_names:
+            _emit(f"{self.colors.WARNING}No interface information available{self.colors.ENDC}")
             return
 
-        table = PrettyTable()
-        table.field_names = [
-            f"{self.colors.BOLD}Interface{self.colors.ENDC}",
-            f"{self.colors.BOLD}IP Address{self.colors.ENDC}",
-            f"{self.colors.BOLD}Netmask{self.colors.ENDC}",
-            f"{self.colors.BOLD}MAC Address{self.colors.ENDC}",
-            f"{self.colors.BOLD}Broadcast{self.colors.ENDC}"
-        ]
-        table.align = "l"
-        
-        for iface, details in self.interface_details.items():
-            table.add_row([
-                f"{self.colors.OKBLUE}{iface}{self.colors.ENDC}",
-                details['IP'],
-                details['Netmask'],
-                details['MAC'] or "N/A",
-                details.get('Broadcast', 'N/A')
-            ])
-        
-        print(table)
+        self._print_table(self._INTERFACE_FIELDS, [
+            [blue(iface), ip, mask, mac or "N/A", bcast]
+            for iface, ip, mask, mac, bcast in zip(
+                self._if_names, self._if_ips, self._if_masks, self._if_macs, self._if_bcasts
+            )
+        ])
 
     def _display_routing_table(self):
         """Display routing table"""
         if isinstance(self.routing_table, dict) and 'error' in self.routing_table:
-            print(f"{self.colors.FAIL}{self.routing_table['error']}{self.colors.ENDC}")
+            _emit(f"{self.colors.FAIL}{self.routing_table['error']}{self.colors.ENDC}")
             return
 
-        table = PrettyTable()
-        table.field_names = [
-            f"{self.colors.BOLD}Destination{self.colors.ENDC}",
-            f"{self.colors.BOLD}Gateway{self.colors.ENDC}",
-            f"{self.colors.BOLD}Netmask{self.colors.ENDC}",
-            f"{self.colors.BOLD}Interface{self.colors.ENDC}",
-            f"{self.colors.BOLD}Metric/Flags{self.colors.ENDC}"
-        ]
-        table.align = "l"
-        
-        for route in self.routing_table:
-            table.add_row([
+        self._print_table(self._ROUTE_FIELDS, [
+            [
                 route.get("Destination", "N/A"),
                 route.get("Gateway", "N/A"),
                 route.get("Netmask", route.get("Genmask", "N/A")),
                 route.get("Interface", "N/A"),
                 route.get("Metric", route.get("Flags", "N/A"))
-            ])
-        
-        print(table)
+            ]
+            for route in self.routing_table
+        ])
 
     def _display_gateways(self):
         """Display gateway information"""
         if not self.gateway_info:
-            print(f"{self.colors.WARNING}No gateway information available{self.colors.ENDC}")
+            _emit(f"{self.colors.WARNING}No gateway information available{self.colors.ENDC}")
             return
 
-        table = PrettyTable()
-        table.field_names = [
-            f"{self.colors.BOLD}Type{self.colors.ENDC}",
-            f"{self.colors.BOLD}Gateway IP{self.colors.ENDC}",
-            f"{self.colors.BOLD}Interface{self.colors.ENDC}"
-        ]
-        table.align = "l"
-        
-        for family, gateway_info in self.gateway_info.items():
-            if len(gateway_info) >= 2:
-                table.add_row([
-                    f"{self.colors.OKBLUE}{'IPv4' if family == netifaces.AF_INET else 'IPv6'}{self.colors.ENDC}",
-                    gateway_info[0],
-                    gateway_info[1]
-                ])
-        
-        print(table)
+        self._print_table(self._GATEWAY_FIELDS, [
+            [
+                self._IPV4_LABEL if family == netifaces.AF_INET else self._IPV6_LABEL,
+                gateway_info[0],
+                gateway_info[1]
+            ]
+            for family, gateway_info in self.gateway_info.items()
+            if len(gateway_info) >= 2
+        ])
+
+    @staticmethod
+    def _print_raw(output):
+        """Print command output, decoding it only if it is still raw bytes"""
+        if isinstance(output, bytes):
+            output = output.decode('utf-8', 'ignore')
+        print(output)
 
     def _display_arp_table(self):
         """Display ARP table"""
-        print(self.arp_table)
+        self._print_raw(self.arp_table)
 
     def _display_dns_info(self):
         """Display DNS information"""
-        print(self.dns_info)
+        self._print_raw(self.dns_info)
 
     def _display_external_ip(self):
         """Display external IP"""
-        print(f"Your public IP address: {self.colors.OKGREEN}{self.external_ip}{self.colors.ENDC}")
+        _emit(f"Your public IP address: {green(self.external_ip)}")
 
     def _display_wifi_info(self):
         """Display WiFi information"""
         if not self.wifi_info:
-            print(f"{self.colors.WARNING}No WiFi information available{self.colors.ENDC}")
+            _emit(f"{self.colors.WARNING}No WiFi information available{self.colors.ENDC}")
             return
 
-        table = PrettyTable()
-        table.field_names = [f"{self.colors.BOLD}Property{self.colors.ENDC}", f"{self.colors.BOLD}Value{self.colors.ENDC}"]
-        table.align = "l"
-        
-        for key, value in self.wifi_info.items():
-            table.add_row([
-                f"{self.colors.OKBLUE}{key}{self.colors.ENDC}",
-                f"{self.colors.OKGREEN}{value}{self.colors.ENDC}"
-            ])
-        
-        print(table)
+        self._print_key_value_table(self._PROPERTY_FIELDS, self.wifi_info)
 
     def _display_active_connections(self):
         """Display active connections"""
-        print(self.active_connections)
+        self._print_raw(self.active_connections)
 
     def _display_speed_test(self):
         """Display speed test results"""
         if not self.speed_test_results:
-            print(f"{self.colors.WARNING}Speed test not run yet. Use run_speed_test() first.{self.colors.ENDC}")
+            _emit(f"{self.colors.WARNING}Speed test not run yet. Use run_speed_test() first.{self.colors.ENDC}")
             return
         
         if 'Error' in self.speed_test_results:
-            print(f"{self.colors.FAIL}Error: {self.speed_test_results['Error']}{self.colors.ENDC}")
+            _emit(f"{self.colors.FAIL}Error: {self.speed_test_results['Error']}{self.colors.ENDC}")
             return
         
-        table = PrettyTable()
-        table.field_names = [f"{self.colors.BOLD}Metric{self.colors.ENDC}", f"{self.colors.BOLD}Value{self.colors.ENDC}"]
-        table.align = "l"
-        
-        for metric, value in self.speed_test_results.items():
-            table.add_row([
-                f"{self.colors.OKBLUE}{metric}{self.colors.ENDC}",
-                f"{self.colors.OKGREEN}{value}{self.colors.ENDC}"
-            ])
-        
-        print(table)
+        self._print_key_value_table(self._METRIC_FIELDS, self.speed_test_results)
 
 def main():
     analyzer = NetworkAnalyzerPro()